@@ -1,12 +1,54 @@
 import requests
 import csv
+import gzip
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
 
 # Configuration
 API_BASE_URL = "https://api.fordefi.com/api/v1"
 API_TOKEN = "{TOKEN HERE}"  # Replace with your actual API token
+MAX_WORKERS = 16  # Number of pages fetched concurrently
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) timeouts in seconds
+CSV_FILENAME = "fordefi_transactions.csv"  # End with ".gz" to write gzip-compressed output
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for the output CSV
+
+# CSV columns, in the order extract_transaction_data() returns them
+FIELDNAMES = [
+    "Transaction ID",
+    "Transaction Network",
+    "Transaction Type",
+    "Created At",
+    "Initiator",
+    "Origin Vault",
+    "Policy Match - Is Default",
+    "Policy Match - Rule Name",
+    "Policy Match - Action Type",
+    "Direction",
+    "Approvers"
+]
+
+# Shared session: keeps TCP/TLS connections alive across pages and threads
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
 
 def get_transactions(page: int = 1, size: int = 50) -> Dict[str, Any]:
     """
@@ -30,18 +72,19 @@ def get_transactions(page: int = 1, size: int = 50) -> Dict[str, Any]:
     }
     
     try:
-        response = requests.get(
+        response = _session.get(
             f"{API_BASE_URL}/transactions",
             headers=headers,
-            params=params
+            params=params,
+            timeout=REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return _loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Error fetching transactions: {e}")
         sys.exit(1)
 
-def extract_transaction_data(transaction: Dict[str, Any]) -> Dict[str, str]:
+def extract_transaction_data(transaction: Dict[str, Any]) -> Tuple[str, ...]:
     """
     Extract relevant fields from a transaction object.
     
@@ -49,104 +92,130 @@ def extract_transaction_data(transaction: Dict[str, Any]) -> Dict[str, str]:
         transaction: Transaction dictionary from API response
     
     Returns:
-        Dictionary with extracted fields for CSV
+        CSV row with the extracted fields, ordered as FIELDNAMES
     """
-    # Transaction ID
-    tx_id = transaction.get("id", "")
+    get = transaction.get
+    managed_data = get("managed_transaction_data", {})
+    policy_match = managed_data.get("policy_match", {})
     
-    # Transaction Network (chain name)
-    chain = transaction.get("chain", {})
-    network = chain.get("name", "")
+    # Approvers (if approval was required)
+    approvers_str = ""
+    approval_request = managed_data.get("approval_request")
+    if approval_request:
+        approvers_str = "; ".join([
+            f"{name} ({state})"
+            for name, state in (
+                ((approver.get("user") or {}).get("name", ""), approver.get("state", ""))
+                for approver in (approval_request.get("approvers") or [])
+            )
+            if name
+        ])
+    
+    return (
+        get("id", ""),                                          # Transaction ID
+        get("chain", {}).get("name", ""),                       # Transaction Network
+        get("type", ""),                                        # Transaction Type
+        get("created_at", ""),                                  # Created At
+        managed_data.get("created_by", {}).get("name", ""),     # Initiator
+        get("vault", {}).get("name", ""),                       # Origin Vault
+        str(policy_match.get("is_default", "")).lower(),        # Policy Match - Is Default
+        policy_match.get("rule_name", ""),                      # Policy Match - Rule Name
+        policy_match.get("action_type", ""),                    # Policy Match - Action Type
+        get("direction", ""),                                   # Direction
+        approvers_str                                           # Approvers
+    )
+
+def iter_pages(size: int = 50) -> Iterator[Dict[str, Any]]:
+    """
+    Yield transaction pages from the Fordefi API in page order.
     
-    # Transaction Type
-    tx_type = transaction.get("type", "")
+    Page 1 is fetched first to learn the total; the remaining pages are
+    fetched through a sliding window of MAX_WORKERS in-flight requests, so
+    only one window of pages is held in memory and a slow page never
+    stalls the requests behind it.
     
-    # Created At
-    created_at = transaction.get("created_at", "")
+    Args:
+        size: Number of transactions per page
     
-    # Initiator (created by name)
-    managed_data = transaction.get("managed_transaction_data", {})
-    created_by = managed_data.get("created_by", {})
-    initiator = created_by.get("name", "")
+    Yields:
+        JSON response for each page
+    """
+    print("Fetching page 1...")
+    first = get_transactions(page=1, size=size)
+    yield first
     
-    # Origin Vault (vault name)
-    vault = transaction.get("vault", {})
-    origin_vault = vault.get("name", "")
+    n_pages = math.ceil(first.get("total", 0) / size)
+    if n_pages <= 1:
+        return
     
-    # Policy Match details
-    policy_match = managed_data.get("policy_match", {})
-    is_default = str(policy_match.get("is_default", "")).lower()
-    rule_name = policy_match.get("rule_name", "")
-    action_type = policy_match.get("action_type", "")
+    print(f"Fetching pages 2-{n_pages} concurrently...")
+    pages = iter(range(2, n_pages + 1))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        in_flight = deque(
+            executor.submit(get_transactions, page=p, size=size)
+            for p in islice(pages, MAX_WORKERS)
+        )
+        while in_flight:
+            # Results are consumed in page order, keeping the CSV stable
+            response = in_flight.popleft().result()
+            for p in islice(pages, 1):
+                in_flight.append(executor.submit(get_transactions, page=p, size=size))
+            yield response
+
+def open_csv(path: str, compress: bool):
+    """
+    Open a CSV file for writing.
     
-    # Direction
-    direction = transaction.get("direction", "")
+    Compressed files are gzip level 1, which costs little CPU but shrinks
+    large exports several times over.
     
-    # Approvers (if approval was required)
-    approvers = []
-    approval_request = managed_data.get("approval_request", {})
-    if approval_request:
-        approvers_list = approval_request.get("approvers", [])
-        for approver in approvers_list:
-            user = approver.get("user", {})
-            approver_name = user.get("name", "")
-            decision = approver.get("decision", "")
-            state = approver.get("state", "")
-            if approver_name:
-                approvers.append(f"{approver_name} ({state})")
-    
-    approvers_str = "; ".join(approvers) if approvers else ""
-    
-    return {
-        "Transaction ID": tx_id,
-        "Transaction Network": network,
-        "Transaction Type": tx_type,
-        "Created At": created_at,
-        "Initiator": initiator,
-        "Origin Vault": origin_vault,
-        "Policy Match - Is Default": is_default,
-        "Policy Match - Rule Name": rule_name,
-        "Policy Match - Action Type": action_type,
-        "Direction": direction,
-        "Approvers": approvers_str
-    }
+    Args:
+        path: File to open
+        compress: Whether to gzip-compress the output
+    
+    Returns:
+        Writable text file object
+    """
+    if compress:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=1)
+    return open(path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
 
-def export_to_csv(transactions: List[Dict[str, str]], filename: str = "fordefi_transactions.csv"):
+def export_to_csv(pages: Iterable[List[Tuple[str, ...]]], filename: str = CSV_FILENAME):
     """
-    Export transaction data to CSV file.
+    Stream transaction data to a CSV file, one page of rows at a time.
+    
+    Rows go to a temporary file that replaces filename only once every page
+    has been written, so a failed run leaves the previous export intact.
     
     Args:
-        transactions: List of transaction dictionaries
-        filename: Output CSV filename
+        pages: Iterable of row lists, each row ordered as FIELDNAMES
+        filename: Output CSV filename (gzip-compressed if it ends in ".gz")
     """
-    if not transactions:
+    pages = (rows for rows in pages if rows)
+    first = next(pages, None)
+    if first is None:
         print("No transactions to export.")
         return
     
-    fieldnames = [
-        "Transaction ID",
-        "Transaction Network",
-        "Transaction Type",
-        "Created At",
-        "Initiator",
-        "Origin Vault",
-        "Policy Match - Is Default",
-        "Policy Match - Rule Name",
-        "Policy Match - Action Type",
-        "Direction",
-        "Approvers"
-    ]
-    
+    tmp_filename = filename + ".tmp"
     try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(transactions)
+        with open_csv(tmp_filename, compress=filename.endswith(".gz")) as csvfile:
+            writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(FIELDNAMES)
+            count = 0
+            for rows in chain([first], pages):
+                writer.writerows(rows)
+                count += len(rows)
+        os.replace(tmp_filename, filename)
         
-        print(f"Successfully exported {len(transactions)} transactions to {filename}")
+        print(f"Successfully exported {count} transactions to {filename}")
     except IOError as e:
         print(f"Error writing to CSV file: {e}")
         sys.exit(1)
+    finally:
+        # Only left behind if a page fetch or write failed part way through
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
 
 def main():
     """
@@ -154,36 +223,12 @@ def main():
     """
     print("Fetching transactions from Fordefi API...")
     
-    all_transactions = []
-    page = 1
-    size = 50
-    
-    while True:
-        print(f"Fetching page {page}...")
-        response = get_transactions(page=page, size=size)
-        
-        transactions = response.get("transactions", [])
-        if not transactions:
-            break
-        
-        # Extract data from each transaction
-        for tx in transactions:
-            tx_data = extract_transaction_data(tx)
-            all_transactions.append(tx_data)
-        
-        # Check if there are more pages
-        total = response.get("total", 0)
-        fetched = page * size
-        
-        if fetched >= total:
-            break
-        
-        page += 1
-    
-    print(f"Total transactions fetched: {len(all_transactions)}")
-    
-    # Export to CSV
-    export_to_csv(all_transactions)
+    # Fetch, extract and write one page at a time
+    pages = (
+        list(map(extract_transaction_data, page.get("transactions", [])))
+        for page in iter_pages(size=50)
+    )
+    export_to_csv(pages)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
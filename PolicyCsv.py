@@ -2,7 +2,47 @@ import requests
 import csv
 import json
 import os
-from typing import Any, Dict, List, Tuple, Set
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as _UrllibHTTPError
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it the response is parsed in one go
+    ijson = None
+
+_JSON_ERRORS: Tuple[type, ...] = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
+
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) timeouts in seconds
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for the output CSV
+
+# Shared fallback for missing nested objects, so `(x or _EMPTY).get(...)`
+# doesn't allocate a new dict on every miss. Never mutate it.
+_EMPTY: Dict[str, Any] = {}
+
+# Condition types as the API normally sends them, and their precomputed labels
+_KNOWN_COND_TYPES = frozenset(("any", "all", "custom"))
+_ANY_ALL_LABELS: Dict[Tuple[str, str], str] = {
+    (ctype, noun): f"{ctype.capitalize()} {noun}"
+    for ctype in ("all", "any")
+    for noun in ("users", "vaults", "dapps", "addresses", "contacts")
+}
+
+# Shared session: keeps TCP/TLS connections alive between requests
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
 
 
 def _display_name(obj: Dict[str, Any], *, fallbacks: Tuple[str, ...] = ("name", "email", "id")) -> str:
@@ -29,7 +69,7 @@ def _fmt_address(a: Any) -> str:
 def _fmt_contact(contact: Dict[str, Any]) -> str:
     """Format an address book contact as 'Name <address> (ChainLabel)' where possible."""
     name = _display_name(contact, fallbacks=("name", "id"))
-    addr_ref = (contact.get("address_ref") or {})
+    addr_ref = (contact.get("address_ref") or _EMPTY)
     address = addr_ref.get("address") or ""
     chain_label = addr_ref.get("chain_type") or ""
     chains = addr_ref.get("chains") or []
@@ -42,15 +82,43 @@ def _fmt_contact(contact: Dict[str, Any]) -> str:
                 chain_names.append(str(ch))
         chain_label = ", ".join([c for c in chain_names if c]) or chain_label
 
-    if chain_label and address:
-        return f"{name} <{address}> ({chain_label})"
-    if address:
-        return f"{name} <{address}>"
-    return name
+    if not address:
+        return name
+    if chain_label:
+        return "".join((name, " <", address, "> (", chain_label, ")"))
+    return "".join((name, " <", address, ">"))
+
+
+def _fmt_dapps(dapps: List[Any]) -> str:
+    """Format dapps as 'Name (ID: id, Chain: ChainName)', joined with ' | '."""
+    info: List[str] = []
+    for d in dapps:
+        d = d or _EMPTY
+        name = d.get("name", "Unknown")
+        did = d.get("id", "N/A")
+        chain_name = (d.get("chain") or _EMPTY).get("name", "N/A")
+        info.append(f"{name} (ID: {did}, Chain: {chain_name})")
+    return " | ".join(info)
+
+
+def _join_sorted_unique(items: Iterable[str], sep: str = ", ") -> str:
+    """Dedupe, sort and join display strings for a single CSV cell."""
+    unique = list(dict.fromkeys(items))
+    unique.sort()
+    return sep.join(unique)
+
+
+def _cond_type(cond: Dict[str, Any]) -> str:
+    """Return a condition's type, lowercasing only values that aren't already canonical."""
+    ctype = cond.get("type") or ""
+    return ctype if ctype in _KNOWN_COND_TYPES else ctype.lower()
 
 
 def _label_any_all(cond_type: str, noun_plural: str) -> str:
     """Create a human label for any/all conditions."""
+    label = _ANY_ALL_LABELS.get((cond_type, noun_plural))
+    if label is not None:
+        return label
     cond_type = (cond_type or "").lower()
     if cond_type == "all":
         return f"All {noun_plural}"
@@ -65,16 +133,16 @@ def extract_transaction_assets(assets_data: Any) -> str:
         return ""
     items: List[str] = []
     for item in assets_data:
-        ai = {}
+        ai = _EMPTY
         if isinstance(item, dict):
-            ai = item.get("asset_info", {})
+            ai = item.get("asset_info", _EMPTY)
             if not ai and any(k in item for k in ("asset_identifier", "name", "symbol")):
                 ai = item
         name = ai.get("name") or ai.get("symbol") or "Unknown"
         chain_name = (
-            (ai.get("asset_identifier") or {}).get("chain", {}).get("name")
-            or (ai.get("chain") or {}).get("name")
-            or (ai.get("asset_identifier") or {}).get("details", {}).get("chain")
+            (ai.get("asset_identifier") or _EMPTY).get("chain", _EMPTY).get("name")
+            or (ai.get("chain") or _EMPTY).get("name")
+            or (ai.get("asset_identifier") or _EMPTY).get("details", _EMPTY).get("chain")
             or "N/A"
         )
         items.append(f"{name} ({chain_name})")
@@ -90,21 +158,19 @@ def extract_initiators(initiators: Any) -> Dict[str, str]:
       Flat: users / user_refs / user_groups / user_group_refs
       Conditional: users_conditions / initiators_conditions with type 'any'|'all'|'custom'
     """
-    out_users: Set[str] = set()
-    out_groups: Set[str] = set()
+    out_users: List[str] = []
+    out_groups: List[str] = []
 
     if not isinstance(initiators, dict):
         return {}
 
     def _add_users(items: Any):
         if isinstance(items, list):
-            for u in items:
-                out_users.add(_display_name(u, fallbacks=("name", "email", "id")))
+            out_users.extend(_display_name(u, fallbacks=("name", "email", "id")) for u in items)
 
     def _add_groups(items: Any):
         if isinstance(items, list):
-            for g in items:
-                out_groups.add(_display_name(g, fallbacks=("name", "id")))
+            out_groups.extend(_display_name(g, fallbacks=("name", "id")) for g in items)
 
     # Flat
     _add_users(initiators.get("users"))
@@ -114,15 +180,15 @@ def extract_initiators(initiators: Any) -> Dict[str, str]:
 
     # Conditional
     cond = (
-        (initiators.get("users_conditions") or {}).get("condition")
-        or (initiators.get("initiators_conditions") or {}).get("condition")
+        (initiators.get("users_conditions") or _EMPTY).get("condition")
+        or (initiators.get("initiators_conditions") or _EMPTY).get("condition")
     )
     if isinstance(cond, dict):
-        ctype = (cond.get("type") or "").lower()
+        ctype = _cond_type(cond)
         if ctype in ("all", "any"):
             label = _label_any_all(ctype, "users")
             if label:
-                out_users.add(label)
+                out_users.append(label)
         else:
             _add_users(cond.get("users"))
             _add_users(cond.get("user_refs"))
@@ -131,9 +197,9 @@ def extract_initiators(initiators: Any) -> Dict[str, str]:
 
     out: Dict[str, str] = {}
     if out_users:
-        out["initiator_users"] = ", ".join(sorted(out_users))
+        out["initiator_users"] = _join_sorted_unique(out_users)
     if out_groups:
-        out["initiator_user_groups"] = ", ".join(sorted(out_groups))
+        out["initiator_user_groups"] = _join_sorted_unique(out_groups)
     return out
 
 
@@ -144,21 +210,19 @@ def extract_origins(origins: Any) -> Dict[str, str]:
       - origin_vault_groups
     Supports flat keys and vaults_conditions.condition with type 'any'|'all'|'custom'.
     """
-    out_vaults: Set[str] = set()
-    out_groups: Set[str] = set()
+    out_vaults: List[str] = []
+    out_groups: List[str] = []
 
     if not isinstance(origins, dict):
         return {}
 
     def _add_vaults(items: Any):
         if isinstance(items, list):
-            for v in items:
-                out_vaults.add(_display_name(v, fallbacks=("name", "id")))
+            out_vaults.extend(_display_name(v, fallbacks=("name", "id")) for v in items)
 
     def _add_groups(items: Any):
         if isinstance(items, list):
-            for g in items:
-                out_groups.add(_display_name(g, fallbacks=("name", "id")))
+            out_groups.extend(_display_name(g, fallbacks=("name", "id")) for g in items)
 
     # Flat (if API ever sends these at top-level)
     _add_vaults(origins.get("vaults"))
@@ -167,13 +231,13 @@ def extract_origins(origins: Any) -> Dict[str, str]:
     _add_groups(origins.get("vault_group_refs"))
 
     # Conditional
-    vc = (origins.get("vaults_conditions") or {}).get("condition")
+    vc = (origins.get("vaults_conditions") or _EMPTY).get("condition")
     if isinstance(vc, dict):
-        ctype = (vc.get("type") or "").lower()
+        ctype = _cond_type(vc)
         if ctype in ("all", "any"):
             label = _label_any_all(ctype, "vaults")
             if label:
-                out_vaults.add(label)
+                out_vaults.append(label)
         else:
             _add_vaults(vc.get("vaults"))
             _add_vaults(vc.get("vault_refs"))
@@ -182,9 +246,9 @@ def extract_origins(origins: Any) -> Dict[str, str]:
 
     out: Dict[str, str] = {}
     if out_vaults:
-        out["origin_vaults"] = ", ".join(sorted(out_vaults))
+        out["origin_vaults"] = _join_sorted_unique(out_vaults)
     if out_groups:
-        out["origin_vault_groups"] = ", ".join(sorted(out_groups))
+        out["origin_vault_groups"] = _join_sorted_unique(out_groups)
     return out
 
 
@@ -212,17 +276,10 @@ def extract_recipients(recipients: Any) -> Dict[str, str]:
     dapps_parts: List[str] = []
     dapps_flat = recipients.get("dapps")
     if isinstance(dapps_flat, list) and dapps_flat:
-        dapp_info = []
-        for d in dapps_flat:
-            name = (d or {}).get("name", "Unknown")
-            did = (d or {}).get("id", "N/A")
-            chain_name = ((d or {}).get("chain") or {}).get("name", "N/A")
-            dapp_info.append(f"{name} (ID: {did}, Chain: {chain_name})")
-        if dapp_info:
-            dapps_parts.append(" | ".join(dapp_info))
-    dapps_cond = (recipients.get("dapps_conditions") or {}).get("condition")
+        dapps_parts.append(_fmt_dapps(dapps_flat))
+    dapps_cond = (recipients.get("dapps_conditions") or _EMPTY).get("condition")
     if isinstance(dapps_cond, dict):
-        ctype = (dapps_cond.get("type") or "").lower()
+        ctype = _cond_type(dapps_cond)
         if ctype in ("all", "any"):
             label = _label_any_all(ctype, "dapps")
             if label:
@@ -230,96 +287,100 @@ def extract_recipients(recipients: Any) -> Dict[str, str]:
         else:
             dapps_list = dapps_cond.get("dapps")
             if isinstance(dapps_list, list) and dapps_list:
-                info = []
-                for d in dapps_list:
-                    name = (d or {}).get("name", "Unknown")
-                    did = (d or {}).get("id", "N/A")
-                    chain_name = ((d or {}).get("chain") or {}).get("name", "N/A")
-                    info.append(f"{name} (ID: {did}, Chain: {chain_name})")
-                if info:
-                    dapps_parts.append(" | ".join(info))
+                dapps_parts.append(_fmt_dapps(dapps_list))
     if dapps_parts:
         out["recipient_dapps"] = " | ".join([p for p in dapps_parts if p])
 
     # --- ADDRESSES ---
-    addr_set: Set[str] = set()
+    addrs: List[str] = []
     flat_addrs = recipients.get("addresses")
     if isinstance(flat_addrs, list):
         for a in flat_addrs:
-            addr_set.add(_fmt_address(a))
+            addrs.append(_fmt_address(a))
 
-    addrs_cond = (recipients.get("addresses_conditions") or {}).get("condition")
+    addrs_cond = (recipients.get("addresses_conditions") or _EMPTY).get("condition")
     if isinstance(addrs_cond, dict):
-        ctype = (addrs_cond.get("type") or "").lower()
+        ctype = _cond_type(addrs_cond)
         if ctype in ("all", "any"):
-            addr_set.add(_label_any_all(ctype, "addresses"))
+            addrs.append(_label_any_all(ctype, "addresses"))
         else:
             for a in (addrs_cond.get("addresses") or []):
-                addr_set.add(_fmt_address(a))
+                addrs.append(_fmt_address(a))
             groups = addrs_cond.get("address_groups") or []
             if groups:
-                out["recipient_address_groups"] = ", ".join(
-                    sorted({_display_name(g, fallbacks=("name", "id")) for g in groups})
+                out["recipient_address_groups"] = _join_sorted_unique(
+                    _display_name(g, fallbacks=("name", "id")) for g in groups
                 )
 
-    if addr_set:
-        out["recipient_addresses"] = " | ".join(sorted(addr_set))
+    if addrs:
+        out["recipient_addresses"] = _join_sorted_unique(addrs, " | ")
 
     # --- ADDRESS BOOK CONTACTS / GROUPS ---
-    ab_cond = (recipients.get("addressbook_contacts_conditions") or {}).get("condition")
-    contacts: Set[str] = set()
+    ab_cond = (recipients.get("addressbook_contacts_conditions") or _EMPTY).get("condition")
+    contacts: List[str] = []
     if isinstance(ab_cond, dict):
-        ctype = (ab_cond.get("type") or "").lower()
+        ctype = _cond_type(ab_cond)
         if ctype in ("all", "any"):
-            contacts.add(_label_any_all(ctype, "contacts"))
+            contacts.append(_label_any_all(ctype, "contacts"))
         else:
             for c in (ab_cond.get("address_book_contacts") or []):
-                contacts.add(_fmt_contact(c))
+                contacts.append(_fmt_contact(c))
             ab_groups = ab_cond.get("address_book_groups") or []
             if ab_groups:
-                out["recipient_contact_groups"] = ", ".join(
-                    sorted({_display_name(g) for g in ab_groups})
+                out["recipient_contact_groups"] = _join_sorted_unique(
+                    _display_name(g) for g in ab_groups
                 )
     if contacts:
-        out["recipient_contacts"] = " | ".join(sorted(contacts))
+        out["recipient_contacts"] = _join_sorted_unique(contacts, " | ")
 
     # --- RECIPIENT VAULTS / GROUPS (from recipients.vaults_conditions) ---
-    rv_cond = (recipients.get("vaults_conditions") or {}).get("condition")
-    rv_vaults: Set[str] = set()
-    rv_groups: Set[str] = set()
+    rv_cond = (recipients.get("vaults_conditions") or _EMPTY).get("condition")
+    rv_vaults: List[str] = []
+    rv_groups: List[str] = []
     if isinstance(rv_cond, dict):
-        ctype = (rv_cond.get("type") or "").lower()
+        ctype = _cond_type(rv_cond)
         if ctype in ("all", "any"):
-            rv_vaults.add(_label_any_all(ctype, "vaults"))
+            rv_vaults.append(_label_any_all(ctype, "vaults"))
         else:
             for v in (rv_cond.get("vaults") or []):
-                rv_vaults.add(_display_name(v, fallbacks=("name", "id")))
+                rv_vaults.append(_display_name(v, fallbacks=("name", "id")))
             for g in (rv_cond.get("vault_groups") or []):
-                rv_groups.add(_display_name(g, fallbacks=("name", "id")))
+                rv_groups.append(_display_name(g, fallbacks=("name", "id")))
     if rv_vaults:
-        out["recipient_vaults"] = ", ".join(sorted(rv_vaults))
+        out["recipient_vaults"] = _join_sorted_unique(rv_vaults)
     if rv_groups:
-        out["recipient_vault_groups"] = ", ".join(sorted(rv_groups))
+        out["recipient_vault_groups"] = _join_sorted_unique(rv_groups)
 
     return out
 
 
-def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract essential rule data from the API response."""
-    rules = response_data.get('rules', [])
-    extracted_rules: List[Dict[str, Any]] = []
+def stream_rules(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Yield rule objects from a (streamed) policies response.
+    With ijson installed, rules are parsed one at a time straight off the socket,
+    so the full JSON tree is never held in memory.
+    """
+    if ijson is None:
+        yield from _loads(response.content).get('rules', [])
+        return
+    response.raw.decode_content = True  # let urllib3 undo gzip/deflate
+    yield from ijson.items(response.raw, 'rules.item', use_float=True)
+
 
+def iter_rules(rules: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield essential rule data for each rule, one rule at a time."""
     for rule in rules:
+        rule_action = rule.get('rule_action') or _EMPTY
         rule_data: Dict[str, Any] = {
             'rule_id': rule.get('id'),
             'rule_name': rule.get('name'),
-            'rule_action': (rule.get('rule_action') or {}).get('type'),
+            'rule_action': rule_action.get('type'),
             'created_at': rule.get('created_at'),
             'modified_at': rule.get('modified_at'),
-            'modified_by': (rule.get('modified_by') or {}).get('name'),
+            'modified_by': (rule.get('modified_by') or _EMPTY).get('name'),
         }
 
-        conditions = (rule.get('rule_conditions') or {})
+        conditions = (rule.get('rule_conditions') or _EMPTY)
 
         # Transaction types
         tx_types = conditions.get('transaction_types') or []
@@ -327,13 +388,13 @@ def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
             rule_data['transaction_types'] = ", ".join([str(t) for t in tx_types])
 
         # Initiators (users + groups, flat + conditional)
-        rule_data.update(extract_initiators(conditions.get('transaction_initiators') or {}))
+        rule_data.update(extract_initiators(conditions.get('transaction_initiators') or _EMPTY))
 
         # Origins (vaults + groups, flat + conditional)
-        rule_data.update(extract_origins(conditions.get('origins') or {}))
+        rule_data.update(extract_origins(conditions.get('origins') or _EMPTY))
 
         # Recipients (all variants incl. recipients.vaults_conditions)
-        rule_data.update(extract_recipients(conditions.get('recipients') or {}))
+        rule_data.update(extract_recipients(conditions.get('recipients') or _EMPTY))
 
         # ABI methods
         abi_methods = conditions.get('abi_methods') or []
@@ -346,7 +407,7 @@ def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
             rule_data['transaction_assets'] = assets_str
 
         # Amount limit
-        amount_limit = conditions.get('amount_limit') or {}
+        amount_limit = conditions.get('amount_limit') or _EMPTY
         if amount_limit:
             amount = amount_limit.get('amount')
             currency = (amount_limit.get('currency') or 'N/A').upper()
@@ -357,7 +418,7 @@ def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
                 rule_data['amount_limit'] = f"(No numeric amount) {currency} (Net: {is_net})"
 
         # EIP712
-        eip712 = conditions.get('eip712_message') or {}
+        eip712 = conditions.get('eip712_message') or _EMPTY
         if eip712:
             domains = eip712.get('domains') or []
             primary_types = eip712.get('primary_types') or []
@@ -368,7 +429,7 @@ def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         # Approval groups
         if rule_data.get('rule_action') == 'require_approval':
-            approval_groups = (rule.get('rule_action') or {}).get('approval_groups', [])
+            approval_groups = rule_action.get('approval_groups', [])
             if approval_groups:
                 parts = []
                 for g in approval_groups:
@@ -386,18 +447,28 @@ def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
                 if parts:
                     rule_data['approval_groups'] = " | ".join(parts)
 
-        extracted_rules.append(rule_data)
+        yield rule_data
+
+
+def extract_rule_data(response_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract essential rule data from the API response."""
+    return list(iter_rules(response_data.get('rules', [])))
 
-    return extracted_rules
 
+def convert_to_csv(data: Iterable[Dict[str, Any]], output_file: str = 'rules_output.csv'):
+    """
+    Stream extracted data to CSV, writing each rule as it arrives.
 
-def convert_to_csv(data: List[Dict[str, Any]], output_file: str = 'rules_output.csv'):
-    """Convert extracted data to CSV."""
-    if not data:
+    Rules go to a temporary file that replaces output_file only once the whole
+    stream has been written, so a failed read or parse keeps the previous CSV.
+    """
+    data = iter(data)
+    first = next(data, None)
+    if first is None:
         print("No data to write to CSV")
         return
 
-    column_order = [
+    fieldnames = [
         'rule_name',
         'rule_id',
         'rule_action',
@@ -424,21 +495,31 @@ def convert_to_csv(data: List[Dict[str, Any]], output_file: str = 'rules_output.
         'modified_by'
     ]
 
-    all_keys = set()
-    for rule in data:
-        all_keys.update(rule.keys())
+    known = set(fieldnames)
+    dropped: Set[str] = set()
+    count = 0
 
-    fieldnames = [col for col in column_order if col in all_keys]
-    additional_keys = sorted(all_keys - set(fieldnames))
-    fieldnames.extend(additional_keys)
-
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(data)
+    tmp_file = output_file + ".tmp"
+    try:
+        with open(tmp_file, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(fieldnames)
+            for rule in chain([first], data):
+                # Columns are fixed up front, so keys we don't know about can't be added
+                if not known.issuperset(rule):
+                    for key in rule.keys() - known - dropped:
+                        print(f"Warning: dropping unexpected column '{key}'")
+                        dropped.add(key)
+                writer.writerow([rule.get(k, "") for k in fieldnames])
+                count += 1
+        os.replace(tmp_file, output_file)
+    finally:
+        # Only left behind if reading or parsing the stream failed part way through
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
     print(f"CSV file created: {output_file}")
-    print(f"Number of rules: {len(data)}")
+    print(f"Number of rules: {count}")
     print(f"Number of columns: {len(fieldnames)}")
 
 
@@ -453,14 +534,13 @@ def main():
 
     try:
         print(f"Calling API: {API_URL}")
-        response = requests.get(API_URL, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        extracted_rules = extract_rule_data(data)
-        convert_to_csv(extracted_rules)
-    except requests.exceptions.RequestException as e:
+        with _session.get(API_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            convert_to_csv(iter_rules(stream_rules(response)))
+    except (requests.exceptions.RequestException, _UrllibHTTPError) as e:
+        # Errors reading response.raw mid-stream come straight from urllib3
         print(f"Error making API request: {e}")
-    except json.JSONDecodeError as e:
+    except _JSON_ERRORS as e:
         print(f"Error parsing JSON response: {e}")
     except Exception as e:
         print(f"Unexpected error: {e}")
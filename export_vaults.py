@@ -7,8 +7,24 @@ Handles pagination and appends to existing CSV if present.
 
 import requests
 import csv
+import gzip
+import json
+import math
 import os
-from typing import List, Dict
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
 
 # Configuration
 API_BASE_URL = "https://api.fordefi.com"  # Update if different
@@ -17,8 +33,116 @@ API_KEYS = [
     "PASTE_YOUR_SECOND_API_KEY_HERE",
     # Add more API keys as needed
 ]
-CSV_FILENAME = "vault_addresses.csv"
+CSV_FILENAME = "vault_addresses.csv"  # End with ".gz" to write gzip-compressed output
 CSV_HEADERS = ["Vault Name", "Vault Type", "Vault Address"]
+MAX_WORKERS = 10  # Number of vault address lookups run concurrently
+ADDRESS_LOOKAHEAD = 2 * MAX_WORKERS  # Address lookups started ahead of the CSV writer
+MAX_PAGE_WORKERS = 8  # Number of pages fetched concurrently once the total is known
+PAGE_SIZE = 100
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for the output CSV
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) timeouts in seconds
+ADDRESS_CACHE_FILENAME = ".vault_address_cache.sqlite3"  # Delete to force a full refetch
+ADDRESS_CACHE_TTL = 3600  # Seconds a cached address list is reused without asking the API (0 disables the cache)
+ADDRESS_INDEX_SUFFIX = ".addrs"  # Sidecar next to the CSV listing its addresses, one per line
+MAX_CONCURRENT = 8  # Cap on API requests in flight across all threads (FORDEFI_MAX_CONCURRENT overrides it)
+
+# Shared session: keeps TCP/TLS connections to the API alive across requests and threads.
+# Throttled (429) and unavailable (503) responses are retried with exponential backoff,
+# honoring any Retry-After header. raise_on_status=False hands the last response back
+# once retries run out, so the status-code checks below still report the error.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+))
+
+_max_concurrent_env = os.environ.get("FORDEFI_MAX_CONCURRENT", "").strip()
+if _max_concurrent_env:
+    try:
+        MAX_CONCURRENT = max(1, int(_max_concurrent_env))
+    except ValueError:
+        raise SystemExit(f"❌ Error: FORDEFI_MAX_CONCURRENT must be a whole number, got {_max_concurrent_env!r}")
+
+# Keys, pages and vault address lookups are all fetched in parallel; this bounds the total.
+# At least one slot is always available, otherwise the first request would block forever.
+_request_slots = threading.Semaphore(max(1, MAX_CONCURRENT))
+
+
+def rate_limited_get(url: str, **kwargs) -> requests.Response:
+    """
+    GET through the shared session, holding one of MAX_CONCURRENT request slots.
+    
+    Args:
+        url: Request URL
+        **kwargs: Passed through to SESSION.get
+        
+    Returns:
+        The response
+    """
+    with _request_slots:
+        return SESSION.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+
+
+def fetch_pages(url: str, headers: Dict[str, str], items_key: str,
+                first_page_headers: Optional[Dict[str, str]] = None) -> Iterator[Tuple[int, requests.Response, Optional[Dict[str, Any]]]]:
+    """
+    Fetch every page of a paginated endpoint.
+    Page 1 is fetched first to learn the total; the remaining pages are then
+    fetched concurrently and yielded in page order. A short page always marks
+    the end, and if the API omits the total, pages are requested one by one
+    until a short page comes back.
+    
+    Args:
+        url: Endpoint URL
+        headers: Request headers (including authentication)
+        items_key: Response field holding the page's items (e.g. "vaults")
+        first_page_headers: Extra headers sent with page 1 only (e.g. If-None-Match)
+        
+    Yields:
+        (page number, response, parsed JSON) tuples; the JSON is None for
+        non-200 responses (including a 304 for page 1), after which no further
+        pages are yielded
+    """
+    def get_page(page: int, extra_headers: Optional[Dict[str, str]] = None) -> Tuple[int, requests.Response, Optional[Dict[str, Any]]]:
+        params = {
+            "page": page,
+            "size": PAGE_SIZE
+        }
+        page_headers = {**headers, **extra_headers} if extra_headers else headers
+        response = rate_limited_get(url, headers=page_headers, params=params)
+        data = _loads(response.content) if response.status_code == 200 else None
+        return page, response, data
+    
+    first = get_page(1, first_page_headers)
+    yield first
+    
+    data = first[2]
+    if data is None:
+        return
+    
+    size = data.get("size") or PAGE_SIZE
+    if len(data.get(items_key) or []) < size:
+        return
+    
+    if "total" not in data:
+        page = 1
+        while True:
+            page += 1
+            result = get_page(page)
+            yield result
+            if result[2] is None or len(result[2].get(items_key) or []) < size:
+                return
+    
+    num_pages = math.ceil(data["total"] / size)
+    if num_pages <= 1:
+        return
+    
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+        for result in executor.map(get_page, range(2, num_pages + 1)):
+            yield result
+            if result[2] is None:
+                return
 
 
 def fetch_all_vaults(api_key: str) -> List[Dict]:
@@ -32,7 +156,7 @@ def fetch_all_vaults(api_key: str) -> List[Dict]:
         List of vault dictionaries
     """
     all_vaults = []
-    page = 1
+    total = 0
     
     # Clean the API key
     api_key = api_key.strip()
@@ -44,24 +168,17 @@ def fetch_all_vaults(api_key: str) -> List[Dict]:
     
     print("\n🔄 Starting to fetch vaults...")
     
-    while True:
-        url = f"{API_BASE_URL}/api/v1/vaults"
-        params = {
-            "page": page,
-            "size": 100
-        }
+    url = f"{API_BASE_URL}/api/v1/vaults"
+    for page, response, data in fetch_pages(url, headers, "vaults"):
+        print(f"📡 Fetching vaults page {page}...", end=" ")
         
-        print(f"📡 Fetching vaults page {page}...", end=" ", flush=True)
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
+        if data is None:
             print(f"\n❌ Error: {response.status_code}")
             print(response.text)
             break
         
         print(f"✅ Success")
             
-        data = response.json()
         vaults = data.get("vaults", [])
         
         if not vaults:
@@ -70,24 +187,71 @@ def fetch_all_vaults(api_key: str) -> List[Dict]:
             
         all_vaults.extend(vaults)
         print(f"   📊 Retrieved {len(vaults)} vaults (total so far: {len(all_vaults)})")
-        
-        # Check if there are more pages
-        total = data.get("total", 0)
-        fetched_so_far = page * data.get("size", 100)
-        
-        if fetched_so_far >= total:
-            print(f"✨ All pages fetched! (Total: {total} vaults)")
-            break
-            
-        page += 1
+        # Fall back to the running count when the API omits the total
+        total = data.get("total", len(all_vaults))
+    else:
+        print(f"✨ All pages fetched! (Total: {total} vaults)")
     
     print(f"\n🎉 Total vaults fetched: {len(all_vaults)}\n")
     return all_vaults
 
 
+_cache_lock = threading.Lock()
+_cache_conn: Optional[sqlite3.Connection] = None
+
+
+def _address_cache() -> sqlite3.Connection:
+    """Open the on-disk vault address cache (once), creating it if needed. Call with _cache_lock held."""
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(ADDRESS_CACHE_FILENAME, check_same_thread=False, isolation_level=None)
+        _cache_conn.execute(
+            "CREATE TABLE IF NOT EXISTS vault_addresses "
+            "(vault_id TEXT PRIMARY KEY, addresses TEXT NOT NULL, etag TEXT, fetched_at REAL NOT NULL)"
+        )
+    return _cache_conn
+
+
+def load_cached_addresses(vault_id: str) -> Optional[Tuple[List[str], Optional[str], float]]:
+    """
+    Look up a vault's cached address list.
+    
+    Args:
+        vault_id: The vault ID
+        
+    Returns:
+        (addresses, ETag, fetch timestamp), or None if the vault isn't cached
+    """
+    with _cache_lock:
+        row = _address_cache().execute(
+            "SELECT addresses, etag, fetched_at FROM vault_addresses WHERE vault_id = ?", (vault_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1], row[2]
+
+
+def store_cached_addresses(vault_id: str, addresses: List[str], etag: Optional[str]):
+    """
+    Save a vault's address list to the on-disk cache, stamped with the current time.
+    
+    Args:
+        vault_id: The vault ID
+        addresses: List of address strings
+        etag: ETag of the addresses response, if it can be used to revalidate the list
+    """
+    with _cache_lock:
+        _address_cache().execute(
+            "INSERT OR REPLACE INTO vault_addresses VALUES (?, ?, ?, ?)",
+            (vault_id, json.dumps(addresses), etag, time.time())
+        )
+
+
 def fetch_vault_addresses(vault_id: str, api_key: str) -> List[str]:
     """
     Fetch addresses for a specific vault.
+    Results are cached on disk: lists younger than ADDRESS_CACHE_TTL are reused as-is,
+    older ones are revalidated with If-None-Match when the API supplied an ETag.
     
     Args:
         vault_id: The vault ID
@@ -97,27 +261,42 @@ def fetch_vault_addresses(vault_id: str, api_key: str) -> List[str]:
         List of address strings
     """
     addresses = []
-    page = 1
     
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
     
-    while True:
-        url = f"{API_BASE_URL}/api/v1/vaults/{vault_id}/addresses"
-        params = {
-            "page": page,
-            "size": 100
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
+    url = f"{API_BASE_URL}/api/v1/vaults/{vault_id}/addresses"
+    
+    use_cache = ADDRESS_CACHE_TTL > 0
+    cached = load_cached_addresses(vault_id) if use_cache else None
+    revalidate_headers = None
+    if cached:
+        cached_addresses, cached_etag, fetched_at = cached
+        if time.time() - fetched_at < ADDRESS_CACHE_TTL:
+            return cached_addresses
+        if cached_etag:
+            # A 304 reuses the cached list; a 200 is used as page 1 of a full fetch
+            revalidate_headers = {"If-None-Match": cached_etag}
+    
+    etag = None
+    pages_fetched = 0
+    complete = True
+    for page, response, data in fetch_pages(url, headers, "addresses", revalidate_headers):
+        if data is None:
+            # An unsolicited 304 (no If-None-Match sent) is treated as a failure
+            if response.status_code == 304 and revalidate_headers is not None:
+                store_cached_addresses(vault_id, cached_addresses, cached_etag)
+                return cached_addresses
             print(f"      ⚠️  Failed to fetch addresses: {response.status_code}")
+            complete = False
             break
+        
+        pages_fetched += 1
+        if page == 1:
+            etag = response.headers.get("ETag")
             
-        data = response.json()
         address_objs = data.get("addresses", [])
         
         if not address_objs:
@@ -129,153 +308,164 @@ def fetch_vault_addresses(vault_id: str, api_key: str) -> List[str]:
             addr_string = address_data.get("address", "")
             if addr_string:
                 addresses.append(addr_string)
-        
-        # Check if there are more pages
-        total = data.get("total", 0)
-        fetched_so_far = page * data.get("size", 100)
-        
-        if fetched_so_far >= total:
-            break
-            
-        page += 1
+    
+    # Only cache complete lists; the ETag covers page 1 only, so keep it just for single-page lists
+    if use_cache and complete:
+        store_cached_addresses(vault_id, addresses, etag if pages_fetched == 1 else None)
     
     return addresses
 
 
-def extract_csv_data(vaults: List[Dict], api_key: str) -> List[Dict]:
+def _handle_cosmos(vault: Dict, lookup: Optional[Future]) -> List[Tuple[str, str, str]]:
+    """Cosmos vaults - addresses are in the chains_addresses array, one row per chain."""
+    vault_name = vault.get("name", "")
+    vault_type = vault.get("type", "")
+    
+    chains_addresses = vault.get("chains_addresses", [])
+    if not chains_addresses:
+        print(" ⚠️  No chain addresses found")
+        return [(vault_name, vault_type, "")]
+    
+    print(f" ✅ Found {len(chains_addresses)} chain address(es)")
+    # Create a row for each chain address
+    return [
+        (f"{vault_name} ({chain_addr.get('chain', '')})", vault_type, chain_addr.get("address", ""))
+        for chain_addr in chains_addresses
+    ]
+
+
+def _handle_ton(vault: Dict, lookup: Optional[Future]) -> List[Tuple[str, str, str]]:
+    """TON vaults - address is in the raw_account field."""
+    raw_account = vault.get("raw_account", "")
+    if raw_account:
+        print(" ✅")
+    else:
+        print(" ⚠️  No raw_account found")
+    return [(vault.get("name", ""), vault.get("type", ""), raw_account)]
+
+
+def _needs_lookup(vault: Dict) -> bool:
+    """
+    Whether a vault's addresses must be fetched from the addresses endpoint.
+    Vaults that report an address_count of 0 are known to be empty and skip the lookup;
+    when the field is absent the lookup always runs.
+    """
+    return (
+        vault.get("type", "") in ("utxo", "black_box")
+        and not vault.get("address", "")
+        and vault.get("address_count", 1) != 0
+    )
+
+
+def _handle_address_lookup(vault: Dict, lookup: Optional[Future]) -> List[Tuple[str, str, str]]:
+    """UTXO and black_box vaults - addresses come from the addresses endpoint, one row per address."""
+    if vault.get("address", ""):
+        return _handle_default(vault, lookup)
+    
+    vault_name = vault.get("name", "")
+    vault_type = vault.get("type", "")
+    
+    addresses = []
+    if _needs_lookup(vault):
+        print(" - fetching addresses...", end="")
+        addresses = lookup.result()
+    
+    if not addresses:
+        print(" ⚠️  No addresses found")
+        return [(vault_name, vault_type, "")]
+    
+    print(f" ✅ Found {len(addresses)} address(es)")
+    # Create a row for each address found
+    return [(vault_name, vault_type, addr) for addr in addresses]
+
+
+def _handle_default(vault: Dict, lookup: Optional[Future]) -> List[Tuple[str, str, str]]:
+    """All other vaults - the address is on the vault object itself."""
+    vault_address = vault.get("address", "")
+    if vault_address:
+        print(" ✅")
+    else:
+        print(" (no address)")
+    return [(vault.get("name", ""), vault.get("type", ""), vault_address)]
+
+
+# Row builders by vault type; each takes the vault and its pending address lookup (if any)
+VAULT_HANDLERS = {
+    "cosmos": _handle_cosmos,
+    "ton": _handle_ton,
+    "utxo": _handle_address_lookup,
+    "black_box": _handle_address_lookup,
+}
+
+
+def extract_csv_data(vaults: List[Dict], api_key: str) -> Iterator[Tuple[str, str, str]]:
     """
     Extract relevant fields for CSV from vault objects.
     For vaults without direct addresses, fetch from addresses endpoint or extract from vault object.
+    Address endpoint lookups run concurrently, MAX_WORKERS at a time, and at most
+    ADDRESS_LOOKAHEAD of them are started ahead of the row being yielded.
     
     Args:
         vaults: List of vault objects from API
         api_key: Bearer token for authentication
         
-    Returns:
-        List of dictionaries with CSV-ready data
+    Yields:
+        (vault name, vault type, vault address) rows, ordered as CSV_HEADERS
     """
-    csv_data = []
-    
     print("🔍 Processing vaults and fetching addresses where needed...\n")
     
-    for i, vault in enumerate(vaults, 1):
-        vault_name = vault.get("name", "")
-        vault_type = vault.get("type", "")
-        vault_address = vault.get("address", "")
-        vault_id = vault.get("id", "")
-        
-        print(f"[{i}/{len(vaults)}] {vault_name} ({vault_type})", end="")
-        
-        # Handle Cosmos vaults - addresses are in chains_addresses array
-        if vault_type == "cosmos":
-            chains_addresses = vault.get("chains_addresses", [])
-            if chains_addresses:
-                print(f" ✅ Found {len(chains_addresses)} chain address(es)")
-                # Create a row for each chain address
-                for chain_addr in chains_addresses:
-                    chain = chain_addr.get("chain", "")
-                    address = chain_addr.get("address", "")
-                    row = {
-                        "Vault Name": f"{vault_name} ({chain})",
-                        "Vault Type": vault_type,
-                        "Vault Address": address
-                    }
-                    csv_data.append(row)
-            else:
-                print(" ⚠️  No chain addresses found")
-                row = {
-                    "Vault Name": vault_name,
-                    "Vault Type": vault_type,
-                    "Vault Address": ""
-                }
-                csv_data.append(row)
+    lookups = iter([i for i, vault in enumerate(vaults, 1) if _needs_lookup(vault)])
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = {}
         
-        # Handle TON vaults - address is in raw_account field
-        elif vault_type == "ton":
-            raw_account = vault.get("raw_account", "")
-            if raw_account:
-                print(" ✅")
-            else:
-                print(" ⚠️  No raw_account found")
-            row = {
-                "Vault Name": vault_name,
-                "Vault Type": vault_type,
-                "Vault Address": raw_account
-            }
-            csv_data.append(row)
+        def submit_lookups(count: int):
+            """Start the next count address lookups, in vault order."""
+            for j in islice(lookups, count):
+                pending[j] = executor.submit(fetch_vault_addresses, vaults[j - 1].get("id", ""), api_key)
         
-        # Handle UTXO vaults - need to fetch from addresses endpoint
-        elif vault_type == "utxo" and not vault_address:
-            print(" - fetching addresses...", end="", flush=True)
-            addresses = fetch_vault_addresses(vault_id, api_key)
-            
-            if addresses:
-                print(f" ✅ Found {len(addresses)} address(es)")
-                # Create a row for each address found
-                for addr in addresses:
-                    row = {
-                        "Vault Name": vault_name,
-                        "Vault Type": vault_type,
-                        "Vault Address": addr
-                    }
-                    csv_data.append(row)
-            else:
-                print(" ⚠️  No addresses found")
-                row = {
-                    "Vault Name": vault_name,
-                    "Vault Type": vault_type,
-                    "Vault Address": ""
-                }
-                csv_data.append(row)
+        # Results are picked up in vault order below; each one taken starts the next lookup
+        submit_lookups(ADDRESS_LOOKAHEAD)
         
-        # Handle black_box vaults - try fetching from addresses endpoint
-        elif vault_type == "black_box" and not vault_address:
-            print(" - fetching addresses...", end="", flush=True)
-            addresses = fetch_vault_addresses(vault_id, api_key)
+        for i, vault in enumerate(vaults, 1):
+            vault_type = vault.get("type", "")
+            print(f"[{i}/{len(vaults)}] {vault.get('name', '')} ({vault_type})", end="")
             
-            if addresses:
-                print(f" ✅ Found {len(addresses)} address(es)")
-                for addr in addresses:
-                    row = {
-                        "Vault Name": vault_name,
-                        "Vault Type": vault_type,
-                        "Vault Address": addr
-                    }
-                    csv_data.append(row)
-            else:
-                print(" ⚠️  No addresses found")
-                row = {
-                    "Vault Name": vault_name,
-                    "Vault Type": vault_type,
-                    "Vault Address": ""
-                }
-                csv_data.append(row)
-        
-        # Handle all other vaults with direct addresses
-        else:
-            if vault_address:
-                print(" ✅")
-            else:
-                print(" (no address)")
+            lookup = pending.pop(i, None)
+            if lookup is not None:
+                submit_lookups(1)
             
-            row = {
-                "Vault Name": vault_name,
-                "Vault Type": vault_type,
-                "Vault Address": vault_address
-            }
-            csv_data.append(row)
+            yield from VAULT_HANDLERS.get(vault_type, _handle_default)(vault, lookup)
     
     print()
-    return csv_data
 
 
-def write_to_csv(data: List[Dict], filename: str, seen_addresses: set):
+def open_csv(filename: str, mode: str):
+    """
+    Open the output CSV for reading, writing or appending.
+    Filenames ending in ".gz" are gzip-compressed at level 1, which costs little CPU
+    but shrinks large exports several times over. Appending adds a new gzip member,
+    which gzip readers treat as one continuous file.
+    
+    Args:
+        filename: Name of the CSV file
+        mode: 'r', 'w' or 'a'
+        
+    Returns:
+        Text file object
+    """
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + 't', newline='', encoding='utf-8', compresslevel=1)
+    return open(filename, mode, newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+
+
+def write_to_csv(data: Iterable[Tuple[str, str, str]], filename: str, seen_addresses: set):
     """
     Write data to CSV, appending if file exists, creating if it doesn't.
     Deduplicates based on addresses.
     
     Args:
-        data: List of dictionaries to write
+        data: Iterable of (vault name, vault type, vault address) rows to write
         filename: Name of the CSV file
         seen_addresses: Set of addresses already in the CSV
         
@@ -285,43 +475,50 @@ def write_to_csv(data: List[Dict], filename: str, seen_addresses: set):
     file_exists = os.path.exists(filename)
     mode = 'a' if file_exists else 'w'
     
-    # Filter out duplicates
-    unique_data = []
+    written = 0
     duplicates_count = 0
     
-    for row in data:
-        address = row["Vault Address"]
-        # Allow multiple entries with blank addresses (they're different vaults)
-        if address == "":
-            unique_data.append(row)
-        elif address not in seen_addresses:
-            unique_data.append(row)
-            seen_addresses.add(address)
-        else:
-            duplicates_count += 1
-    
-    if duplicates_count > 0:
-        print(f"⚠️  Skipped {duplicates_count} duplicate address(es)")
+    def unique_rows():
+        """Yield rows whose address hasn't been seen yet, recording new addresses as we go."""
+        nonlocal written, duplicates_count
+        seen = seen_addresses
+        mark_seen = seen.add
+        for row in data:
+            address = row[2]
+            # Allow multiple entries with blank addresses (they're different vaults)
+            if address:
+                if address in seen:
+                    duplicates_count += 1
+                    continue
+                mark_seen(address)
+            written += 1
+            yield row
     
-    with open(filename, mode, newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
+    with open_csv(filename, mode) as f:
+        writer = csv.writer(f)
         
         # Write header only if creating new file
         if not file_exists:
-            writer.writeheader()
+            writer.writerow(CSV_HEADERS)
             print(f"📝 Created new CSV: {filename}")
         else:
             print(f"📝 Appending to existing CSV: {filename}")
         
-        writer.writerows(unique_data)
+        # Rows are deduplicated lazily as the writer consumes them
+        writer.writerows(unique_rows())
+    
+    if duplicates_count > 0:
+        print(f"⚠️  Skipped {duplicates_count} duplicate address(es)")
     
-    print(f"✅ Wrote {len(unique_data)} unique rows to {filename}")
+    print(f"✅ Wrote {written} unique rows to {filename}")
     return seen_addresses
 
 
 def load_existing_addresses(filename: str) -> set:
     """
     Load existing addresses from CSV to prevent duplicates.
+    The sidecar index written by save_address_index is used when it is at least
+    as new as the CSV; otherwise the CSV itself is parsed.
     
     Args:
         filename: Name of the CSV file
@@ -331,16 +528,40 @@ def load_existing_addresses(filename: str) -> set:
     """
     seen = set()
     if os.path.exists(filename):
-        with open(filename, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                address = row.get("Vault Address", "")
-                if address:  # Only track non-empty addresses
-                    seen.add(address)
+        index_filename = filename + ADDRESS_INDEX_SUFFIX
+        if os.path.exists(index_filename) and os.path.getmtime(index_filename) >= os.path.getmtime(filename):
+            with open(index_filename, 'r', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+                seen = set(f.read().splitlines())
+        else:
+            with open_csv(filename, 'r') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if "Vault Address" in header:
+                    idx = header.index("Vault Address")
+                    # Only track non-empty addresses
+                    seen = {row[idx] for row in reader if len(row) > idx and row[idx]}
         print(f"📂 Loaded {len(seen)} existing addresses from {filename}\n")
     return seen
 
 
+def save_address_index(filename: str, seen_addresses: set):
+    """
+    Write the sidecar address index for a CSV, so the next run can skip parsing it.
+    Must be called after the CSV is written, since the index is only trusted while
+    it is at least as new as the CSV.
+    
+    Args:
+        filename: Name of the CSV file the addresses belong to
+        seen_addresses: Set of addresses in the CSV
+    """
+    index_filename = filename + ADDRESS_INDEX_SUFFIX
+    tmp_filename = index_filename + ".tmp"
+    with open(tmp_filename, 'w', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        f.writelines(f"{address}\n" for address in seen_addresses)
+    # Replace atomically so an interrupted run never leaves a truncated index behind
+    os.replace(tmp_filename, index_filename)
+
+
 def main():
     """Main execution function."""
     # Validate API keys
@@ -355,24 +576,27 @@ def main():
     # Load existing addresses to prevent duplicates
     seen_addresses = load_existing_addresses(CSV_FILENAME)
     
-    # Process each API key
-    for key_index, api_key in enumerate(valid_keys, 1):
-        print(f"{'='*60}")
-        print(f"🔑 Processing API Key {key_index}/{len(valid_keys)}")
-        print(f"{'='*60}\n")
-        
-        # Fetch all vaults with pagination
-        vaults = fetch_all_vaults(api_key)
-        
-        if not vaults:
-            print(f"⚠️  No vaults found for API key {key_index}\n")
-            continue
-        
-        # Extract CSV data (will fetch addresses for certain vault types)
-        csv_data = extract_csv_data(vaults, api_key)
-        
-        # Write to CSV with deduplication
-        seen_addresses = write_to_csv(csv_data, CSV_FILENAME, seen_addresses)
+    # Keys belong to different organizations, so their vault lists are fetched in parallel
+    with ThreadPoolExecutor(max_workers=len(valid_keys)) as executor:
+        vault_lists = list(executor.map(fetch_all_vaults, valid_keys))
+    
+    print(f"{'='*60}")
+    for key_index, vaults in enumerate(vault_lists, 1):
+        if vaults:
+            print(f"🔑 API Key {key_index}/{len(valid_keys)}: {len(vaults)} vault(s)")
+        else:
+            print(f"⚠️  No vaults found for API key {key_index}")
+    print(f"{'='*60}\n")
+    
+    # Rows stream from extraction straight into the CSV, deduplicated in key order
+    if any(vault_lists):
+        rows = chain.from_iterable(
+            extract_csv_data(vaults, api_key)
+            for api_key, vaults in zip(valid_keys, vault_lists)
+            if vaults
+        )
+        seen_addresses = write_to_csv(rows, CSV_FILENAME, seen_addresses)
+        save_address_index(CSV_FILENAME, seen_addresses)
         print()
     
     print(f"{'='*60}")